@@ -0,0 +1,56 @@
+"""
+Direct Postgres connection pool for hot read paths
+Connects through Supabase's Supavisor pooler (transaction mode, port 6543)
+"""
+
+import os
+from typing import Iterator, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+# Load environment variables
+load_dotenv()
+
+# e.g. postgresql://postgres.<ref>:<password>@<region>.pooler.supabase.com:6543/postgres
+SUPAVISOR_URL = os.getenv("SUPAVISOR_URL")
+
+# The Supabase dashboard hands out plain postgres:// / postgresql:// strings, for which SQLAlchemy
+# would pick psycopg2 (not installed) - always use the psycopg 3 driver
+if SUPAVISOR_URL:
+    for scheme in ("postgresql://", "postgres://"):
+        if SUPAVISOR_URL.startswith(scheme):
+            SUPAVISOR_URL = "postgresql+psycopg://" + SUPAVISOR_URL[len(scheme):]
+            break
+    if not SUPAVISOR_URL.startswith("postgresql+psycopg://"):
+        raise ValueError("SUPAVISOR_URL must be a postgresql:// or postgresql+psycopg:// connection string")
+
+engine: Optional[Engine] = None
+SessionLocal: Optional[sessionmaker] = None
+
+if SUPAVISOR_URL:
+    engine = create_engine(
+        SUPAVISOR_URL,
+        pool_size=3,
+        max_overflow=2,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        pool_timeout=30,
+        # Supavisor transaction mode cannot route server-side prepared statements
+        connect_args={"prepare_threshold": None}
+    )
+    SessionLocal = sessionmaker(bind=engine, autoflush=False)
+
+
+def get_db() -> Iterator[Optional[Session]]:
+    """
+    FastAPI dependency yielding a pooled session.
+    Yields None when SUPAVISOR_URL is not configured so callers fall back to the Supabase REST client.
+    """
+    if SessionLocal is None:
+        yield None
+        return
+    with SessionLocal() as session:
+        yield session
@@ -5,15 +5,26 @@ FastAPI backend for salon booking system with Supabase integration
 
 from datetime import date, time
 from enum import Enum
-from typing import List, Optional
+from functools import lru_cache
+import json
+import re
+import threading
+from typing import Annotated, List, Literal, Optional, Tuple, Union
 from uuid import UUID
 
-from fastapi import FastAPI, HTTPException, status
-from pydantic import BaseModel, Field, field_validator
-from supabase import create_client, Client
+from cachetools import LRUCache, TTLCache
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Response, status
+from postgrest.exceptions import APIError
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from supabase import create_client, Client, ClientOptions
+import httpx
 import os
 from dotenv import load_dotenv
 
+from db import get_db
+
 # Load environment variables
 load_dotenv()
 
@@ -31,11 +42,73 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 if not SUPABASE_URL or not SUPABASE_KEY:
     raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in environment variables")
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """Return the shared pooled keep-alive HTTP client used for all Supabase traffic"""
+    return httpx.Client(
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        timeout=10.0
+    )
+
+
+def postgrest_get(table: str, params: dict) -> httpx.Response:
+    """GET a PostgREST table directly on the pooled client, for handlers that pass the raw body through"""
+    result = get_http_client().get(
+        f"{SUPABASE_URL.rstrip('/')}/rest/v1/{table}",
+        params=params,
+        headers={"apikey": SUPABASE_KEY, "Authorization": f"Bearer {SUPABASE_KEY}"}
+    )
+    result.raise_for_status()
+    return result
+
+
+@lru_cache(maxsize=1)
+def get_supabase() -> Client:
+    """Return the shared Supabase client, backed by the pooled HTTP client"""
+    return create_client(SUPABASE_URL, SUPABASE_KEY, options=ClientOptions(httpx_client=get_http_client()))
+
 
 # Constants
 TABLE_NAME = "salon_reservations"
 DEFAULT_DURATION_MINUTES = 60
+AVAILABILITY_CACHE_TTL_SECONDS = 30
+CANCEL_CACHE_TTL_SECONDS = 60
+UNIQUE_VIOLATION = "23505"  # Postgres error code raised by idx_unique_stylist_slot
+DEFAULT_LOOKUP_LIMIT = 50
+MAX_LOOKUP_LIMIT = 100
+MAX_BATCH_OPERATIONS = 20
+# Columns returned to clients; keep in sync with ReservationResponse
+RESERVATION_COLUMNS = "reservation_id,customer_name,phone_number,reservation_date,reservation_time,stylist_name,service_menu,duration_minutes,status,notes,created_at,updated_at"
+# Pooled-Postgres equivalents of the PostgREST reads (see db.py)
+LOOKUP_SQL = text(
+    f"SELECT COALESCE(json_agg(r ORDER BY r.reservation_date, r.reservation_time), '[]'::json)::text FROM ("
+    f"SELECT {RESERVATION_COLUMNS} FROM {TABLE_NAME} "
+    "WHERE phone_number = :phone_number AND status = CAST(:status AS reservation_status) "
+    "ORDER BY reservation_date, reservation_time LIMIT :limit OFFSET :offset) r"
+)
+BOOKED_TIMES_SQL = text(
+    f"SELECT reservation_time FROM {TABLE_NAME} "
+    "WHERE stylist_name = :stylist_name AND reservation_date = :reservation_date AND status = CAST(:status AS reservation_status)"
+)
+ALL_HOURS = tuple(time(hour, 0, 0) for hour in range(9, 17))  # 9 AM to 5 PM
+
+# Booked slots per (stylist_name, reservation_date) - invalidated on every write to that key.
+# The cache is per worker process: a write handled by another worker is not seen here, so a
+# worker can report a just-booked slot as free for up to the TTL. idx_unique_stylist_slot still
+# prevents double-booking, and every 409 invalidates the contested key on the worker that
+# returned it, so a retry against that worker sees the slot as booked.
+_availability_cache: TTLCache = TTLCache(maxsize=4096, ttl=AVAILABILITY_CACHE_TTL_SECONDS)
+# Version token per key, replaced on every invalidation. A reader only stores its query result
+# if the token is unchanged since before the query, so a write racing the read (in this process) is not masked.
+_availability_versions: LRUCache = LRUCache(maxsize=16384)
+_availability_lock = threading.Lock()
+
+# Recent cancellations by reservation_id -> (ETag, response) so retried cancels skip the database.
+# Per worker process: a modify handled by another worker does not evict the entry here, so a
+# retry may get the body as it was at cancel time. The TTL bounds how long that can happen.
+_cancel_cache: TTLCache = TTLCache(maxsize=10000, ttl=CANCEL_CACHE_TTL_SECONDS)
+_cancel_lock = threading.Lock()
 
 
 # Enums
@@ -46,6 +119,20 @@ class ReservationStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+# Matches H:MM, HH:MM, H:MM:SS and HH:MM:SS, with optional fractional seconds and timezone suffix
+_TIME_RE = re.compile(r"^(\d{1,2}):(\d{2})(?::(\d{2})(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?$")
+
+
+def normalize_time_string(v):
+    """Normalize a time string to HH:MM:SS[.ffffff][tz], padding the hour and adding missing seconds"""
+    if isinstance(v, str):
+        match = _TIME_RE.match(v)
+        if match:
+            hour, minute, second, fraction, tz = match.groups()
+            return f"{int(hour):02d}:{minute}:{second or '00'}{fraction or ''}{tz or ''}"
+    return v
+
+
 # Pydantic Models
 class ReservationCreate(BaseModel):
     """Request model for creating a reservation"""
@@ -69,21 +156,7 @@ class ReservationCreate(BaseModel):
     @classmethod
     def normalize_time(cls, v):
         """Accept HH:MM, H:MM, HH:MM:SS, and H:MM:SS formats (handles single-digit hours)"""
-        if isinstance(v, str):
-            parts = v.split(":")
-            if len(parts) == 2:
-                # HH:MM or H:MM format - add seconds
-                hour, minute = parts
-                # Add leading zero to hour if single digit
-                hour = hour.zfill(2)
-                return f"{hour}:{minute}:00"
-            elif len(parts) == 3:
-                # HH:MM:SS or H:MM:SS format - normalize hour
-                hour, minute, second = parts
-                # Add leading zero to hour if single digit
-                hour = hour.zfill(2)
-                return f"{hour}:{minute}:{second}"
-        return v
+        return normalize_time_string(v)
 
 
 class ReservationUpdate(BaseModel):
@@ -109,21 +182,7 @@ class ReservationUpdate(BaseModel):
     @classmethod
     def normalize_time(cls, v):
         """Accept HH:MM, H:MM, HH:MM:SS, and H:MM:SS formats (handles single-digit hours)"""
-        if isinstance(v, str):
-            parts = v.split(":")
-            if len(parts) == 2:
-                # HH:MM or H:MM format - add seconds
-                hour, minute = parts
-                # Add leading zero to hour if single digit
-                hour = hour.zfill(2)
-                return f"{hour}:{minute}:00"
-            elif len(parts) == 3:
-                # HH:MM:SS or H:MM:SS format - normalize hour
-                hour, minute, second = parts
-                # Add leading zero to hour if single digit
-                hour = hour.zfill(2)
-                return f"{hour}:{minute}:{second}"
-        return v
+        return normalize_time_string(v)
 
 
 class ReservationResponse(BaseModel):
@@ -140,6 +199,8 @@ class ReservationResponse(BaseModel):
     notes: Optional[str] = None
     created_at: str
     updated_at: str
+    
+    model_config = ConfigDict(frozen=True, extra="ignore")
 
 
 class ReservationCreateResponse(BaseModel):
@@ -147,6 +208,66 @@ class ReservationCreateResponse(BaseModel):
     message: str
     reservation_id: UUID
     reservation: ReservationResponse
+    
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+
+class BatchModifyPayload(ReservationUpdate):
+    """Batch payload for modifying a reservation"""
+    reservation_id: UUID
+
+
+class BatchCancelPayload(BaseModel):
+    """Batch payload for cancelling a reservation"""
+    reservation_id: UUID
+
+
+class BatchLookupPayload(BaseModel):
+    """Batch payload for looking up scheduled reservations"""
+    phone_number: str
+    limit: int = Field(default=DEFAULT_LOOKUP_LIMIT, ge=1, le=MAX_LOOKUP_LIMIT)
+
+
+class BatchCreateOp(BaseModel):
+    """Batch operation: create"""
+    op: Literal["create"]
+    payload: ReservationCreate
+
+
+class BatchModifyOp(BaseModel):
+    """Batch operation: modify"""
+    op: Literal["modify"]
+    payload: BatchModifyPayload
+
+
+class BatchCancelOp(BaseModel):
+    """Batch operation: cancel"""
+    op: Literal["cancel"]
+    payload: BatchCancelPayload
+
+
+class BatchLookupOp(BaseModel):
+    """Batch operation: lookup"""
+    op: Literal["lookup"]
+    payload: BatchLookupPayload
+
+
+BatchOp = Annotated[Union[BatchCreateOp, BatchModifyOp, BatchCancelOp, BatchLookupOp], Field(discriminator="op")]
+
+
+class BatchRequest(BaseModel):
+    """Request model for running several operations in one transaction"""
+    operations: List[BatchOp] = Field(..., min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+
+class BatchResult(BaseModel):
+    """Result of a single batch operation.
+    reservation is set for create/modify/cancel (None if the target does not exist),
+    reservations is set for lookup.
+    """
+    op: str
+    reservation: Optional[ReservationResponse] = None
+    reservations: Optional[List[ReservationResponse]] = None
 
 
 class AvailabilityResponse(BaseModel):
@@ -158,68 +279,86 @@ class AvailabilityResponse(BaseModel):
 
 
 # Helper Functions
-def check_availability_conflict(stylist_name: str, reservation_date: date, reservation_time: time, exclude_id: Optional[UUID] = None) -> bool:
-    """
-    Check if a stylist is already booked for the given date and time.
-    Returns True if conflict exists, False otherwise.
-    """
+def get_all_hours_in_day() -> Tuple[time, ...]:
+    """Return all possible booking hours in a day (9 AM to 5 PM)"""
+    return ALL_HOURS
+
+
+def build_reservation_data(reservation: ReservationCreate) -> dict:
+    """Convert a create request into a salon_reservations row"""
+    return {
+        "customer_name": reservation.customer_name,
+        "phone_number": reservation.phone_number,
+        "reservation_date": reservation.reservation_date.isoformat(),
+        "reservation_time": reservation.reservation_time.replace(tzinfo=None).isoformat(timespec="seconds"),
+        "stylist_name": reservation.stylist_name,
+        "service_menu": reservation.service_menu,
+        "duration_minutes": reservation.duration_minutes,
+        "status": ReservationStatus.SCHEDULED.value,
+        "notes": reservation.notes
+    }
+
+
+def build_update_data(updates: ReservationUpdate) -> dict:
+    """Convert an update request into modify_reservation() arguments (None keeps the current value)"""
+    return {
+        "reservation_date": updates.reservation_date.isoformat() if updates.reservation_date is not None else None,
+        "reservation_time": updates.reservation_time.replace(tzinfo=None).isoformat(timespec="seconds") if updates.reservation_time is not None else None,
+        "stylist_name": updates.stylist_name,
+        "service_menu": updates.service_menu,
+        "duration_minutes": updates.duration_minutes,
+        "notes": updates.notes
+    }
+
+
+def invalidate_availability(stylist_name: str, reservation_date: str) -> None:
+    """Drop cached booked slots for a stylist/date (date in YYYY-MM-DD format)"""
+    key = (stylist_name, reservation_date)
+    with _availability_lock:
+        _availability_cache.pop(key, None)
+        _availability_versions[key] = object()
+
+
+def conflict_slot(error: APIError) -> Optional[Tuple[str, str]]:
+    """Return the (stylist_name, reservation_date) a unique_violation from our RPCs reports in its DETAIL"""
     try:
-        # Query for scheduled reservations with matching stylist, date, and time
-        query = supabase.table(TABLE_NAME).select("*").eq("stylist_name", stylist_name).eq("reservation_date", reservation_date.strftime("%Y-%m-%d")).eq("reservation_time", reservation_time.strftime("%H:%M:%S")).eq("status", ReservationStatus.SCHEDULED.value)
-        
-        if exclude_id:
-            query = query.neq("reservation_id", str(exclude_id))
-        
-        result = query.execute()
-        
-        # If any records exist, there's a conflict
-        return len(result.data) > 0
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Database error while checking availability: {str(e)}"
-        )
+        detail = json.loads(error.details or "")
+        return detail["stylist_name"], detail["reservation_date"]
+    except (TypeError, ValueError, KeyError):
+        return None
 
 
-def get_all_hours_in_day() -> List[time]:
-    """Generate list of all possible booking hours in a day (9 AM to 5 PM)"""
-    hours = []
-    for hour in range(9, 17):  # 9 AM to 5 PM 
-        hours.append(time(hour, 0, 0))
-    return hours
+def forget_cancellation(reservation_id: str) -> None:
+    """Drop this worker's cached cancel response once the reservation changes again"""
+    with _cancel_lock:
+        _cancel_cache.pop(reservation_id, None)
 
 
 # API Endpoints
 
 @app.post("/add", response_model=ReservationCreateResponse, status_code=status.HTTP_201_CREATED)
-async def create_reservation(reservation: ReservationCreate):
+def create_reservation(reservation: ReservationCreate):
     """
     Create a new reservation.
     
-    Returns 409 Conflict if the stylist is already booked for that time slot.
+    Returns 409 Conflict if the stylist is already booked for that time slot
+    (enforced by the idx_unique_stylist_slot partial unique index).
     """
-    # Check for availability conflict
-    if check_availability_conflict(reservation.stylist_name, reservation.reservation_date, reservation.reservation_time):
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Stylist '{reservation.stylist_name}' is already booked for {reservation.reservation_date} at {reservation.reservation_time.strftime('%H:%M')}"
-        )
-    
     try:
         # Insert new reservation
-        reservation_data = {
-            "customer_name": reservation.customer_name,
-            "phone_number": reservation.phone_number,
-            "reservation_date": reservation.reservation_date.strftime("%Y-%m-%d"),
-            "reservation_time": reservation.reservation_time.strftime("%H:%M:%S"),
-            "stylist_name": reservation.stylist_name,
-            "service_menu": reservation.service_menu,
-            "duration_minutes": reservation.duration_minutes,
-            "status": ReservationStatus.SCHEDULED.value,
-            "notes": reservation.notes
-        }
-        
-        result = supabase.table(TABLE_NAME).insert(reservation_data).execute()
+        reservation_data = build_reservation_data(reservation)
+        
+        try:
+            result = get_supabase().table(TABLE_NAME).insert(reservation_data).execute()
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                # This worker may have cached the slot as free before another worker booked it
+                invalidate_availability(reservation_data["stylist_name"], reservation_data["reservation_date"])
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Stylist '{reservation.stylist_name}' is already booked for {reservation.reservation_date} at {reservation.reservation_time.replace(tzinfo=None).isoformat(timespec='minutes')}"
+                )
+            raise
         
         if not result.data:
             raise HTTPException(
@@ -228,24 +367,12 @@ async def create_reservation(reservation: ReservationCreate):
             )
         
         reservation_record = result.data[0]
+        invalidate_availability(reservation_record["stylist_name"], reservation_record["reservation_date"])
         
-        # Convert to response model
-        response = ReservationResponse(
-            reservation_id=UUID(reservation_record["reservation_id"]),
-            customer_name=reservation_record["customer_name"],
-            phone_number=reservation_record["phone_number"],
-            reservation_date=date.fromisoformat(reservation_record["reservation_date"]),
-            reservation_time=time.fromisoformat(reservation_record["reservation_time"]),
-            stylist_name=reservation_record["stylist_name"],
-            service_menu=reservation_record["service_menu"],
-            duration_minutes=reservation_record["duration_minutes"],
-            status=reservation_record["status"],
-            notes=reservation_record.get("notes"),
-            created_at=reservation_record["created_at"],
-            updated_at=reservation_record["updated_at"]
-        )
+        # Convert to response model (ISO strings are parsed by pydantic-core)
+        response = ReservationResponse.model_validate(reservation_record)
         
-        return ReservationCreateResponse(
+        return ReservationCreateResponse.model_construct(
             message=f"Reservation created successfully for {reservation.customer_name}",
             reservation_id=response.reservation_id,
             reservation=response
@@ -261,39 +388,45 @@ async def create_reservation(reservation: ReservationCreate):
 
 
 @app.get("/lookup/{phone_number}", response_model=List[ReservationResponse])
-async def lookup_reservations(phone_number: str):
+def lookup_reservations(
+    phone_number: str,
+    limit: int = Query(default=DEFAULT_LOOKUP_LIMIT, ge=1, le=MAX_LOOKUP_LIMIT),
+    offset: int = Query(default=0, ge=0),
+    db: Optional[Session] = Depends(get_db)
+):
     """
-    Retrieve all scheduled reservations for a given phone number.
-    Returns list sorted by date and time.
+    Retrieve scheduled reservations for a given phone number.
+    Returns list sorted by date and time, paginated with limit/offset.
     Only returns reservations with status 'scheduled'.
+    Reads through the Supavisor pool when configured, otherwise through PostgREST.
     """
     try:
-        result = supabase.table(TABLE_NAME).select("*").eq("phone_number", phone_number).eq("status", ReservationStatus.SCHEDULED.value).order("reservation_date").order("reservation_time").execute()
-        
-        if not result.data:
+        # Both paths produce the JSON body in the database so it can be passed through without a decode/re-encode cycle
+        if db is not None:
+            body = db.execute(LOOKUP_SQL, {
+                "phone_number": phone_number,
+                "status": ReservationStatus.SCHEDULED.value,
+                "limit": limit,
+                "offset": offset
+            }).scalar_one().encode()
+        else:
+            body = postgrest_get(TABLE_NAME, {
+                "select": RESERVATION_COLUMNS,
+                "phone_number": f"eq.{phone_number}",
+                "status": f"eq.{ReservationStatus.SCHEDULED.value}",
+                "order": "reservation_date.asc,reservation_time.asc",
+                "limit": limit,
+                "offset": offset
+            }).content
+        
+        # The projected columns already match ReservationResponse, so the body is returned unparsed
+        if body.strip() == b"[]":
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"No scheduled reservations found for phone number: {phone_number}"
             )
         
-        reservations = []
-        for record in result.data:
-            reservations.append(ReservationResponse(
-                reservation_id=UUID(record["reservation_id"]),
-                customer_name=record["customer_name"],
-                phone_number=record["phone_number"],
-                reservation_date=date.fromisoformat(record["reservation_date"]),
-                reservation_time=time.fromisoformat(record["reservation_time"]),
-                stylist_name=record["stylist_name"],
-                service_menu=record["service_menu"],
-                duration_minutes=record["duration_minutes"],
-                status=record["status"],
-                notes=record.get("notes"),
-                created_at=record["created_at"],
-                updated_at=record["updated_at"]
-            ))
-        
-        return reservations
+        return Response(content=body, media_type="application/json")
         
     except HTTPException:
         raise
@@ -305,7 +438,7 @@ async def lookup_reservations(phone_number: str):
 
 
 @app.put("/modify/{reservation_id}", response_model=ReservationResponse)
-async def modify_reservation(reservation_id: UUID, updates: ReservationUpdate):
+def modify_reservation(reservation_id: UUID, updates: ReservationUpdate):
     """
     Modify an existing reservation.
     Allowed fields: reservation_date, reservation_time, stylist_name, 
@@ -314,75 +447,36 @@ async def modify_reservation(reservation_id: UUID, updates: ReservationUpdate):
     Returns 409 Conflict if the new time conflicts with another booking.
     """
     try:
-        # First, check if reservation exists
-        existing = supabase.table(TABLE_NAME).select("*").eq("reservation_id", str(reservation_id)).execute()
+        # Build RPC parameters (customer_name is not allowed to be modified)
+        params = {"p_reservation_id": str(reservation_id)}
+        params.update({f"p_{field}": value for field, value in build_update_data(updates).items()})
+        
+        # Lookup, conflict check and update happen in one round-trip (see migrations/001_modify_reservation.sql)
+        try:
+            result = get_supabase().rpc("modify_reservation", params).execute()
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                slot = conflict_slot(e)
+                if slot is not None:
+                    invalidate_availability(*slot)
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=e.message
+                )
+            raise
         
-        if not existing.data:
+        if not result.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Reservation with ID {reservation_id} not found"
             )
         
-        existing_record = existing.data[0]
-        
-        # Build update dictionary (customer_name is not allowed to be modified)
-        update_data = {}
-        if updates.reservation_date is not None:
-            update_data["reservation_date"] = updates.reservation_date.strftime("%Y-%m-%d")
-        if updates.reservation_time is not None:
-            update_data["reservation_time"] = updates.reservation_time.strftime("%H:%M:%S")
-        if updates.stylist_name is not None:
-            update_data["stylist_name"] = updates.stylist_name
-        if updates.service_menu is not None:
-            update_data["service_menu"] = updates.service_menu
-        if updates.duration_minutes is not None:
-            update_data["duration_minutes"] = updates.duration_minutes
-        if updates.notes is not None:
-            update_data["notes"] = updates.notes
-        
-        # Determine the stylist, date, and time to check
-        check_stylist = update_data.get("stylist_name", existing_record["stylist_name"])
-        check_date = update_data.get("reservation_date", existing_record["reservation_date"])
-        check_time = update_data.get("reservation_time", existing_record["reservation_time"])
-        
-        # Convert to proper types for conflict check
-        if isinstance(check_date, str):
-            check_date = date.fromisoformat(check_date)
-        if isinstance(check_time, str):
-            check_time = time.fromisoformat(check_time)
-        
-        # Check for availability conflict (excluding current reservation)
-        if check_availability_conflict(check_stylist, check_date, check_time, exclude_id=reservation_id):
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"Stylist '{check_stylist}' is already booked for {check_date} at {check_time.strftime('%H:%M')}"
-            )
-        
-        # Perform update
-        result = supabase.table(TABLE_NAME).update(update_data).eq("reservation_id", str(reservation_id)).execute()
-        
-        if not result.data:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update reservation"
-            )
-        
-        updated_record = result.data[0]
+        updated_record = result.data
+        invalidate_availability(updated_record["previous_stylist_name"], updated_record["previous_reservation_date"])
+        invalidate_availability(updated_record["stylist_name"], updated_record["reservation_date"])
+        forget_cancellation(updated_record["reservation_id"])
         
-        return ReservationResponse(
-            reservation_id=UUID(updated_record["reservation_id"]),
-            customer_name=updated_record["customer_name"],
-            phone_number=updated_record["phone_number"],
-            reservation_date=date.fromisoformat(updated_record["reservation_date"]),
-            reservation_time=time.fromisoformat(updated_record["reservation_time"]),
-            stylist_name=updated_record["stylist_name"],
-            service_menu=updated_record["service_menu"],
-            duration_minutes=updated_record["duration_minutes"],
-            status=updated_record["status"],
-            notes=updated_record.get("notes"),
-            created_at=updated_record["created_at"],
-            updated_at=updated_record["updated_at"]
-        )
+        return ReservationResponse.model_validate(updated_record)
         
     except HTTPException:
         raise
@@ -394,79 +488,160 @@ async def modify_reservation(reservation_id: UUID, updates: ReservationUpdate):
 
 
 @app.delete("/cancel/{reservation_id}", response_model=ReservationResponse)
-async def cancel_reservation(reservation_id: UUID):
+def cancel_reservation(reservation_id: UUID, response: Response, if_match: Optional[str] = Header(default=None)):
     """
     Cancel a reservation by setting status to 'cancelled'.
     This frees up the time slot for rebooking.
+    
+    The response carries an ETag derived from updated_at. A retry that sends it back
+    in If-Match within CANCEL_CACHE_TTL_SECONDS is answered from this worker's
+    recent-cancellations cache without touching the database. The cache is not shared
+    between workers, so that body can predate a modify handled by another worker.
     """
     try:
-        # Check if reservation exists
-        existing = supabase.table(TABLE_NAME).select("*").eq("reservation_id", str(reservation_id)).execute()
+        if if_match is not None:
+            with _cancel_lock:
+                cached = _cancel_cache.get(str(reservation_id))
+            if cached is not None and cached[0] == if_match:
+                response.headers["ETag"] = cached[0]
+                return cached[1]
+        
+        # Update status to cancelled - an empty result means the reservation does not exist
+        result = get_supabase().table(TABLE_NAME).update({"status": ReservationStatus.CANCELLED.value}).eq("reservation_id", str(reservation_id)).execute()
         
-        if not existing.data:
+        if not result.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Reservation with ID {reservation_id} not found"
             )
         
-        # Update status to cancelled
-        result = supabase.table(TABLE_NAME).update({"status": ReservationStatus.CANCELLED.value}).eq("reservation_id", str(reservation_id)).execute()
+        cancelled_record = result.data[0]
+        invalidate_availability(cancelled_record["stylist_name"], cancelled_record["reservation_date"])
         
-        if not result.data:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to cancel reservation"
-            )
+        cancelled = ReservationResponse.model_validate(cancelled_record)
+        etag = f'W/"{cancelled.updated_at}"'
+        with _cancel_lock:
+            _cancel_cache[str(reservation_id)] = (etag, cancelled)
         
-        cancelled_record = result.data[0]
+        response.headers["ETag"] = etag
+        return cancelled
         
-        return ReservationResponse(
-            reservation_id=UUID(cancelled_record["reservation_id"]),
-            customer_name=cancelled_record["customer_name"],
-            phone_number=cancelled_record["phone_number"],
-            reservation_date=date.fromisoformat(cancelled_record["reservation_date"]),
-            reservation_time=time.fromisoformat(cancelled_record["reservation_time"]),
-            stylist_name=cancelled_record["stylist_name"],
-            service_menu=cancelled_record["service_menu"],
-            duration_minutes=cancelled_record["duration_minutes"],
-            status=cancelled_record["status"],
-            notes=cancelled_record.get("notes"),
-            created_at=cancelled_record["created_at"],
-            updated_at=cancelled_record["updated_at"]
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error cancelling reservation: {str(e)}"
         )
+
+
+@app.post("/batch", response_model=List[BatchResult])
+def batch_reservations(batch: BatchRequest):
+    """
+    Run several operations (create, modify, cancel, lookup) in one round-trip.
+    Operations run in order inside a single database transaction, so if any
+    operation fails none of them are applied.
+    Returns 409 Conflict if any create/modify would double-book a stylist.
+    """
+    try:
+        ops = []
+        for operation in batch.operations:
+            if isinstance(operation, BatchCreateOp):
+                payload = build_reservation_data(operation.payload)
+            elif isinstance(operation, BatchModifyOp):
+                payload = {"reservation_id": str(operation.payload.reservation_id), **build_update_data(operation.payload)}
+            elif isinstance(operation, BatchCancelOp):
+                payload = {"reservation_id": str(operation.payload.reservation_id)}
+            else:
+                payload = operation.payload.model_dump()
+            ops.append({"op": operation.op, "payload": payload})
+        
+        # All operations execute in one Postgres function call (see migrations/003_batch_reservations.sql)
+        try:
+            result = get_supabase().rpc("batch_reservations", {"p_ops": ops}).execute()
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                slot = conflict_slot(e)
+                if slot is not None:
+                    invalidate_availability(*slot)
+                # The whole batch rolled back; also drop every slot it tried to take
+                for operation in ops:
+                    payload = operation["payload"]
+                    if payload.get("stylist_name") and payload.get("reservation_date"):
+                        invalidate_availability(payload["stylist_name"], payload["reservation_date"])
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=e.message
+                )
+            raise
+        
+        for op_result in result.data:
+            record = op_result.get("reservation")
+            if record:
+                invalidate_availability(record["stylist_name"], record["reservation_date"])
+                # Any batch write (cancel included) changes updated_at, so a cached cancel ETag is stale
+                forget_cancellation(record["reservation_id"])
+                if "previous_stylist_name" in record:
+                    invalidate_availability(record["previous_stylist_name"], record["previous_reservation_date"])
+        
+        return result.data
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error cancelling reservation: {str(e)}"
+            detail=f"Error running batch: {str(e)}"
         )
 
 
 @app.get("/availability", response_model=AvailabilityResponse)
-async def check_availability(reservation_date: date, stylist: str):
+def check_availability(reservation_date: date, stylist: str, response: Response, db: Optional[Session] = Depends(get_db)):
     """
     Check availability for a stylist on a specific date.
     Returns list of booked and available time slots.
+    Booked slots are cached briefly per worker and invalidated whenever that worker writes a reservation.
+    Reads through the Supavisor pool when configured, otherwise through PostgREST.
     
     Query Parameters:
     - reservation_date: Date in YYYY-MM-DD format
     - stylist: Stylist name
     """
     try:
-        # Get all scheduled reservations for the stylist on the given date
-        result = supabase.table(TABLE_NAME).select("reservation_time").eq("stylist_name", stylist).eq("reservation_date", reservation_date.strftime("%Y-%m-%d")).eq("status", ReservationStatus.SCHEDULED.value).execute()
-        
-        booked_times = []
-        if result.data:
-            booked_times = [time.fromisoformat(record["reservation_time"]) for record in result.data]
+        cache_key = (stylist, reservation_date.isoformat())
+        with _availability_lock:
+            booked_times = _availability_cache.get(cache_key)
+            if booked_times is None:
+                version = _availability_versions.setdefault(cache_key, object())
+        
+        if booked_times is None:
+            # Get all scheduled reservations for the stylist on the given date
+            if db is not None:
+                booked_times = list(db.execute(BOOKED_TIMES_SQL, {
+                    "stylist_name": stylist,
+                    "reservation_date": reservation_date,
+                    "status": ReservationStatus.SCHEDULED.value
+                }).scalars())
+            else:
+                result = get_supabase().table(TABLE_NAME).select("reservation_time").eq("stylist_name", stylist).eq("reservation_date", reservation_date.isoformat()).eq("status", ReservationStatus.SCHEDULED.value).execute()
+                
+                booked_times = []
+                if result.data:
+                    booked_times = [time.fromisoformat(record["reservation_time"]) for record in result.data]
+            
+            with _availability_lock:
+                # An evicted or replaced token means a write may have landed mid-query - don't cache
+                if _availability_versions.get(cache_key) is version:
+                    _availability_cache[cache_key] = booked_times
         
         # Get all possible hours (9 AM to 5 PM)
         all_hours = get_all_hours_in_day()
         
         # Calculate available slots
-        available_times = [t for t in all_hours if t not in booked_times]
+        booked_set = set(booked_times)
+        available_times = [t for t in all_hours if t not in booked_set]
+        
+        response.headers["Cache-Control"] = f"max-age={AVAILABILITY_CACHE_TTL_SECONDS}, stale-while-revalidate=60"
         
         return AvailabilityResponse(
             date=reservation_date,
@@ -490,9 +665,10 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "create": "POST /add",
-            "lookup": "GET /lookup/{phone_number}",
+            "lookup": "GET /lookup/{phone_number}?limit=50&offset=0",
             "modify": "PUT /modify/{reservation_id}",
             "cancel": "DELETE /cancel/{reservation_id}",
+            "batch": "POST /batch",
             "availability": "GET /availability?reservation_date=YYYY-MM-DD&stylist=NAME",
             "docs": "GET /docs"
         }
@@ -0,0 +1,61 @@
+-- Migration 001: modify_reservation() RPC used by PUT /modify
+-- Idempotent - safe to run on an existing database (Supabase SQL editor or psql).
+-- Apply before deploying the API version that calls it.
+
+-- Modify a reservation in a single round-trip.
+-- NULL parameters keep the current value. Returns NULL when the reservation does not exist,
+-- otherwise the updated row plus previous_stylist_name / previous_reservation_date
+-- (so the API can invalidate the slot that was vacated).
+-- A clash with another scheduled booking raises unique_violation (23505), with the
+-- contested stylist_name / reservation_date as JSON in the error DETAIL.
+CREATE OR REPLACE FUNCTION modify_reservation(
+    p_reservation_id UUID,
+    p_reservation_date DATE DEFAULT NULL,
+    p_reservation_time TIME DEFAULT NULL,
+    p_stylist_name TEXT DEFAULT NULL,
+    p_service_menu TEXT DEFAULT NULL,
+    p_duration_minutes INTEGER DEFAULT NULL,
+    p_notes TEXT DEFAULT NULL
+)
+RETURNS JSONB AS $$
+DECLARE
+    old_rec salon_reservations;
+    new_rec salon_reservations;
+BEGIN
+    SELECT * INTO old_rec FROM salon_reservations WHERE reservation_id = p_reservation_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+
+    BEGIN
+        UPDATE salon_reservations SET
+            reservation_date = COALESCE(p_reservation_date, reservation_date),
+            reservation_time = COALESCE(p_reservation_time, reservation_time),
+            stylist_name = COALESCE(p_stylist_name, stylist_name),
+            service_menu = COALESCE(p_service_menu, service_menu),
+            duration_minutes = COALESCE(p_duration_minutes, duration_minutes),
+            notes = COALESCE(p_notes, notes)
+        WHERE reservation_id = p_reservation_id
+        RETURNING * INTO new_rec;
+    EXCEPTION WHEN unique_violation THEN
+        RAISE EXCEPTION 'Stylist ''%'' is already booked for % at %',
+            COALESCE(p_stylist_name, old_rec.stylist_name),
+            COALESCE(p_reservation_date, old_rec.reservation_date),
+            to_char(COALESCE(p_reservation_time, old_rec.reservation_time), 'HH24:MI')
+            USING ERRCODE = 'unique_violation',
+                  -- Lets the API invalidate its cached availability for the contested slot
+                  DETAIL = json_build_object(
+                      'stylist_name', COALESCE(p_stylist_name, old_rec.stylist_name),
+                      'reservation_date', COALESCE(p_reservation_date, old_rec.reservation_date)
+                  )::TEXT;
+    END;
+
+    RETURN to_jsonb(new_rec) || jsonb_build_object(
+        'previous_stylist_name', old_rec.stylist_name,
+        'previous_reservation_date', old_rec.reservation_date
+    );
+END;
+$$ language 'plpgsql';
+
+-- Make the new function visible to PostgREST immediately
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,15 @@
+-- Migration 002: composite indexes for GET /lookup and GET /availability
+-- Idempotent - safe to run on an existing database (Supabase SQL editor or psql).
+-- New databases already get these indexes from schema.sql.
+
+-- GET /lookup: filter on phone_number + status, ordered by date and time
+CREATE INDEX IF NOT EXISTS idx_phone_status_date_time
+ON salon_reservations (phone_number, status, reservation_date, reservation_time);
+
+-- GET /availability: filter on stylist + date + status; INCLUDE allows an index-only scan
+CREATE INDEX IF NOT EXISTS idx_stylist_date_status
+ON salon_reservations (stylist_name, reservation_date, status) INCLUDE (reservation_time);
+
+-- Superseded: both are leading prefixes of the indexes above
+DROP INDEX IF EXISTS idx_phone_number;
+DROP INDEX IF EXISTS idx_stylist_date;
@@ -0,0 +1,94 @@
+-- Migration 003: batch_reservations() RPC used by POST /batch
+-- Idempotent - safe to run on an existing database (Supabase SQL editor or psql).
+-- Requires migration 001 (calls modify_reservation()). Apply before deploying the API version that calls it.
+
+-- Run a list of operations in one transaction.
+-- p_ops is a JSON array of {"op": "create" | "modify" | "cancel" | "lookup", "payload": {...}}.
+-- Returns one {"op", "reservation"} (or {"op", "reservations"} for lookup) object per operation;
+-- reservation is NULL when a modify/cancel target does not exist.
+-- Any error aborts the whole batch.
+CREATE OR REPLACE FUNCTION batch_reservations(p_ops JSONB)
+RETURNS JSONB AS $$
+DECLARE
+    op_item JSONB;
+    payload JSONB;
+    rec salon_reservations;
+    op_result JSONB;
+    results JSONB := '[]'::JSONB;
+BEGIN
+    FOR op_item IN SELECT * FROM jsonb_array_elements(p_ops)
+    LOOP
+        payload := op_item->'payload';
+
+        CASE op_item->>'op'
+        WHEN 'create' THEN
+            BEGIN
+                INSERT INTO salon_reservations (
+                    customer_name, phone_number, reservation_date, reservation_time,
+                    stylist_name, service_menu, duration_minutes, status, notes
+                ) VALUES (
+                    payload->>'customer_name',
+                    payload->>'phone_number',
+                    (payload->>'reservation_date')::DATE,
+                    (payload->>'reservation_time')::TIME,
+                    payload->>'stylist_name',
+                    payload->>'service_menu',
+                    (payload->>'duration_minutes')::INTEGER,
+                    'scheduled',
+                    payload->>'notes'
+                )
+                RETURNING * INTO rec;
+            EXCEPTION WHEN unique_violation THEN
+                RAISE EXCEPTION 'Stylist ''%'' is already booked for % at %',
+                    payload->>'stylist_name',
+                    payload->>'reservation_date',
+                    to_char((payload->>'reservation_time')::TIME, 'HH24:MI')
+                    USING ERRCODE = 'unique_violation',
+                          DETAIL = json_build_object(
+                              'stylist_name', payload->>'stylist_name',
+                              'reservation_date', payload->>'reservation_date'
+                          )::TEXT;
+            END;
+            op_result := jsonb_build_object('reservation', to_jsonb(rec));
+
+        WHEN 'modify' THEN
+            op_result := jsonb_build_object('reservation', modify_reservation(
+                (payload->>'reservation_id')::UUID,
+                (payload->>'reservation_date')::DATE,
+                (payload->>'reservation_time')::TIME,
+                payload->>'stylist_name',
+                payload->>'service_menu',
+                (payload->>'duration_minutes')::INTEGER,
+                payload->>'notes'
+            ));
+
+        WHEN 'cancel' THEN
+            UPDATE salon_reservations SET status = 'cancelled'
+            WHERE reservation_id = (payload->>'reservation_id')::UUID
+            RETURNING * INTO rec;
+            op_result := jsonb_build_object('reservation', CASE WHEN FOUND THEN to_jsonb(rec) END);
+
+        WHEN 'lookup' THEN
+            op_result := jsonb_build_object('reservations', COALESCE((
+                SELECT jsonb_agg(to_jsonb(r) ORDER BY r.reservation_date, r.reservation_time)
+                FROM (
+                    SELECT * FROM salon_reservations
+                    WHERE phone_number = payload->>'phone_number' AND status = 'scheduled'
+                    ORDER BY reservation_date, reservation_time
+                    LIMIT (payload->>'limit')::INTEGER
+                ) r
+            ), '[]'::JSONB));
+
+        ELSE
+            RAISE EXCEPTION 'Unknown batch operation: %', op_item->>'op';
+        END CASE;
+
+        results := results || jsonb_build_array(jsonb_build_object('op', op_item->>'op') || op_result);
+    END LOOP;
+
+    RETURN results;
+END;
+$$ language 'plpgsql';
+
+-- Make the new function visible to PostgREST immediately
+NOTIFY pgrst, 'reload schema';
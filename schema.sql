@@ -28,9 +28,13 @@ ON salon_reservations (stylist_name, reservation_date, reservation_time)
 WHERE status = 'scheduled';
 
 -- Create indexes for fast lookups
-CREATE INDEX idx_phone_number ON salon_reservations (phone_number);
+-- GET /lookup: filter on phone_number + status, ordered by date and time
+CREATE INDEX idx_phone_status_date_time
+ON salon_reservations (phone_number, status, reservation_date, reservation_time);
+-- GET /availability: filter on stylist + date + status; INCLUDE allows an index-only scan
+CREATE INDEX idx_stylist_date_status
+ON salon_reservations (stylist_name, reservation_date, status) INCLUDE (reservation_time);
 CREATE INDEX idx_reservation_date ON salon_reservations (reservation_date);
-CREATE INDEX idx_stylist_date ON salon_reservations (stylist_name, reservation_date);
 CREATE INDEX idx_status ON salon_reservations (status);
 
 -- Create function to automatically update updated_at timestamp
@@ -54,3 +58,5 @@ COMMENT ON COLUMN salon_reservations.reservation_id IS 'Primary key, UUID genera
 COMMENT ON COLUMN salon_reservations.phone_number IS 'Used for caller identification in voice system';
 COMMENT ON COLUMN salon_reservations.status IS 'scheduled: active booking, completed: finished appointment, cancelled: freed slot';
 COMMENT ON INDEX idx_unique_stylist_slot IS 'Prevents double-booking: unique constraint on (stylist, date, time) for scheduled status only';
+
+-- API functions (modify_reservation, batch_reservations) live in migrations/ - apply those after this file.